@@ -204,8 +204,7 @@ class Grid(col.MutableSequence):
         '''
         if not isinstance(value, dict):
             raise TypeError('value must be a dict')
-        for val in value.values():
-            self._detect_or_validate(val)
+        self._detect_or_validate_row(value)
         if "id" in self._row[index]:
             self._index.pop(self._row[index]['id'], None)
         self._row[index] = value
@@ -226,8 +225,7 @@ class Grid(col.MutableSequence):
         '''
         if not isinstance(value, dict):
             raise TypeError('value must be a dict')
-        for val in value.values():
-            self._detect_or_validate(val)
+        self._detect_or_validate_row(value)
         self._row.insert(index, value)
         if "id" in value:
             if not self._index:
@@ -243,13 +241,25 @@ class Grid(col.MutableSequence):
             if "id" in item:
                 self._index[str(item["id"])] = item
 
-    # FIXME
     def extend(self, values):
-        super(Grid, self).extend(values)  # Python 2 compatible :-(
-        # super().extend(values)  # Python 3+ :-)
-        for item in self._row:
-            if "id" in item:
-                self._index[str(item["id"])] = item
+        '''
+        Append all the given rows to the end of the grid.  Only the new rows
+        are indexed, rather than re-indexing the whole grid.
+        '''
+        rows = list(values)
+        for value in rows:
+            if not isinstance(value, dict):
+                raise TypeError('value must be a dict')
+            self._detect_or_validate_row(value)
+        self._row.extend(rows)
+
+        with_id = [value for value in rows if "id" in value]
+        if with_id:
+            if not self._index:
+                self.reindex()
+            else:
+                for value in with_id:
+                    self._index[str(value["id"])] = value
 
     def filter(self, filter, limit=0):
         '''
@@ -280,13 +290,21 @@ class Grid(col.MutableSequence):
         the version if given.
         '''
         if (val is NA) \
-                or isinstance(val, list) \
-                or isinstance(val, dict) \
-                or isinstance(val, SortableDict) \
-                or isinstance(val, Grid):
+                or isinstance(val, (list, dict, SortableDict, Grid)):
             # Project Haystack 3.0 type.
             self._assert_version(VER_3_0)
 
+    def _detect_or_validate_row(self, row):
+        '''
+        Detect or validate the version against all values in a row.  A grid
+        that is already version 3.0 or later accepts every type we know of,
+        so there is nothing to check.
+        '''
+        if self._version >= VER_3_0:
+            return
+        for val in row.values():
+            self._detect_or_validate(val)
+
     def _assert_version(self, version):
         '''
         Assert that the grid version is equal to or above the given value.
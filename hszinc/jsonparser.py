@@ -28,6 +28,18 @@ MARKER_STR = 'm:'
 NA_STR = 'z:'
 REMOVE2_STR = 'x:'
 REMOVE3_STR = '-:'
+
+# Strictly speaking: x: is a HS 2.0 Remove, and -: is a 3.0 Remove
+# but we'll treat both the same.
+SINGLETONS = {
+    MARKER_STR: MARKER,
+    NA_STR: NA,
+    REMOVE2_STR: REMOVE,
+    REMOVE3_STR: REMOVE,
+    'n:INF': float('INF'),
+    'n:-INF': -float('INF'),
+    'n:NaN': float('nan'),
+}
 NUMBER_RE = re.compile(r'^n:(-?\d+(:?\.\d+)?(:?[eE][+\-]?\d+)?)(:? (.*))?$',
                        flags=re.MULTILINE)
 REF_RE = re.compile(r'^r:([a-zA-Z0-9_:\-.~]+)(:? (.*))?$',
@@ -73,11 +85,11 @@ def parse_grid(grid_str):
         grid.column[name] = meta
 
     # Parse the rows
-    for row in (parsed.pop('rows', []) or []):
-        parsed_row = {}
-        for col, value in row.items():
-            parsed_row[col] = parse_embedded_scalar(value, version=version)
-        grid.append(parsed_row)
+    grid.extend([
+        {col: parse_embedded_scalar(value, version=version)
+         for (col, value) in row.items()}
+        for row in (parsed.pop('rows', []) or [])
+    ])
 
     return grid
 
@@ -103,115 +115,150 @@ def parse_embedded_scalar(scalar, version=LATEST_VER):
             return parse_grid(scalar)
         else:
             return {k: parse_scalar(v, version=version) for (k, v) in scalar.items()}
-    elif scalar == MARKER_STR:
-        return MARKER
-    elif scalar == NA_STR:
-        return NA
-    elif (scalar == REMOVE2_STR) or (scalar == REMOVE3_STR):
-        # Strictly speaking: x: is a HS 2.0 Remove, and -: is a 3.0 Remove
-        # but we'll treat both the same.
-        return REMOVE
     elif isinstance(scalar, bool):
         return scalar
-    elif scalar == 'n:INF':
-        return float('INF')
-    elif scalar == 'n:-INF':
-        return -float('INF')
-    elif scalar == 'n:NaN':
-        return float('nan')
     # Conversion to dict of float value turn them into float 
     # so regex won't work... better just return them
     elif isinstance(scalar, float) or isinstance(scalar, six.integer_types):
         return scalar
 
-    # Is it a number?
+    # Is it a singleton?
+    try:
+        return SINGLETONS[scalar]
+    except KeyError:
+        pass
+
+    # Hand it to the parser for its type prefix.
+    try:
+        parse_fn = SCALAR_PARSERS[scalar[:2]]
+    except KeyError:
+        return scalar
+    return parse_fn(scalar)
+
+
+def _parse_number(scalar):
     match = NUMBER_RE.match(scalar)
-    if match:
-        # We'll get a value and a unit, amongst other tokens.
-        matched = match.groups()
-        value = float(matched[0])
-        if matched[-1] is not None:
-            # It's a quantity
-            return Quantity(value, matched[-1])
-        else:
-            # It's a raw value
-            return value
+    if not match:
+        return scalar
+
+    # We'll get a value and a unit, amongst other tokens.
+    matched = match.groups()
+    value = float(matched[0])
+    if matched[-1] is not None:
+        # It's a quantity
+        return Quantity(value, matched[-1])
+    else:
+        # It's a raw value
+        return value
+
 
-    # Is it a string?
-    if scalar.startswith('s:'):
-        return scalar[2:]
+def _parse_str(scalar):
+    return scalar[2:]
 
-    # Is it a xstr?
-    if scalar.startswith('x:'):
-        return XStr(*scalar[2:].split(':'))
 
-    # Is it a reference?
+def _parse_xstr(scalar):
+    return XStr(*scalar[2:].split(':'))
+
+
+def _parse_ref(scalar):
     match = REF_RE.match(scalar)
-    if match:
-        matched = match.groups()
-        if matched[-1] is not None:
-            return Ref(matched[0], matched[-1], has_value=True)
-        else:
-            return Ref(matched[0])
+    if not match:
+        return scalar
 
-    # Is it a date?
+    matched = match.groups()
+    if matched[-1] is not None:
+        return Ref(matched[0], matched[-1], has_value=True)
+    else:
+        return Ref(matched[0])
+
+
+def _parse_date(scalar):
     match = DATE_RE.match(scalar)
-    if match:
-        (year, month, day) = match.groups()
-        return datetime.date(year=int(year), month=int(month), day=int(day))
+    if not match:
+        return scalar
+
+    (year, month, day) = match.groups()
+    return datetime.date(year=int(year), month=int(month), day=int(day))
 
-    # Is it a time?
+
+def _parse_time(scalar):
     match = TIME_RE.match(scalar)
-    if match:
-        (hour, minute, _, second, _) = match.groups()
-        # Convert second to seconds and microseconds
-        if second is None:
-            sec = 0
-            usec = 0
-        elif '.' in second:
-            (whole_sec, frac_sec) = second.split('.', 1)
-            sec = int(whole_sec)
-            usec = int(frac_sec[:6].ljust(6, '0'))
-        else:
-            sec = int(second)
-            usec = 0
-        return datetime.time(hour=int(hour), minute=int(minute),
-                             second=sec, microsecond=usec)
+    if not match:
+        return scalar
+
+    (hour, minute, _, second, _) = match.groups()
+    # Convert second to seconds and microseconds
+    if second is None:
+        sec = 0
+        usec = 0
+    elif '.' in second:
+        (whole_sec, frac_sec) = second.split('.', 1)
+        sec = int(whole_sec)
+        usec = int(frac_sec[:6].ljust(6, '0'))
+    else:
+        sec = int(second)
+        usec = 0
+    return datetime.time(hour=int(hour), minute=int(minute),
+                         second=sec, microsecond=usec)
 
-    # Is it a date/time?
+
+def _parse_datetime(scalar):
     match = DATETIME_RE.match(scalar)
-    if match:
-        matches = match.groups()
-        # Parse ISO8601 component
-        isodate = iso8601.parse_date(matches[0])
-        # Parse timezone
-        tzname = matches[-1]
-        if tzname is None:
-            return isodate  # No timezone given
-        else:
-            try:
-                tz = timezone(tzname)
-                return isodate.astimezone(tz)
-            except:  # pragma: no cover
-                # Unlikely code path.
-                return isodate
-
-    # Is it a URI?
+    if not match:
+        return scalar
+
+    matches = match.groups()
+    # Parse ISO8601 component
+    isodate = iso8601.parse_date(matches[0])
+    # Parse timezone
+    tzname = matches[-1]
+    if tzname is None:
+        return isodate  # No timezone given
+    else:
+        try:
+            tz = timezone(tzname)
+            return isodate.astimezone(tz)
+        except:  # pragma: no cover
+            # Unlikely code path.
+            return isodate
+
+
+def _parse_uri(scalar):
     match = URI_RE.match(scalar)
-    if match:
-        return Uri(match.group(1))
+    if not match:
+        return scalar
+    return Uri(match.group(1))
 
-    # Is it a Bin?
+
+def _parse_bin(scalar):
     match = BIN_RE.match(scalar)
-    if match:
-        return Bin(match.group(1))
+    if not match:
+        return scalar
+    return Bin(match.group(1))
 
-    # Is it a co-ordinate?
+
+def _parse_coord(scalar):
     match = COORD_RE.match(scalar)
-    if match:
-        (lat, lng) = match.groups()
-        return Coordinate(float(lat), float(lng))
-    return scalar
+    if not match:
+        return scalar
+    (lat, lng) = match.groups()
+    return Coordinate(float(lat), float(lng))
+
+
+# Parsers for each type of scalar, by type prefix.  Each returns the scalar
+# as-is if it does not match.
+SCALAR_PARSERS = {
+    'n:': _parse_number,
+    's:': _parse_str,
+    'x:': _parse_xstr,
+    'r:': _parse_ref,
+    'd:': _parse_date,
+    'h:': _parse_time,
+    't:': _parse_datetime,
+    'u:': _parse_uri,
+    'b:': _parse_bin,
+    'c:': _parse_coord,
+}
 
 
 def parse_scalar(scalar, version=LATEST_VER):
@@ -17,9 +17,6 @@ import json
 # Bring in version handling
 from .version import Version, LATEST_VER
 
-# Trailing newline sanitation
-TRAILING_NL_RE = re.compile(r'\n+$')
-
 GRID_SEP = re.compile(r'(?<=\n)\n+')
 
 MODE_ZINC = 'text/zinc'
@@ -73,7 +70,18 @@ def parse(grid_str, mode=MODE_ZINC, charset='utf-8', single=True):
         if isinstance(grid_data, dict):
             grid_data = [grid_data]
     else:
-        grid_data = GRID_SEP.split(TRAILING_NL_RE.sub('\n', grid_str))
+        # Trailing newline sanitation: collapse any run of newlines at the
+        # end down to one.
+        if grid_str.endswith('\n'):
+            grid_str = grid_str.rstrip('\n') + '\n'
+
+        # Most of the time there is only one grid; a plain substring search
+        # for a blank line is much cheaper than running the regex over the
+        # whole string.
+        if '\n\n' in grid_str:
+            grid_data = GRID_SEP.split(grid_str)
+        else:
+            grid_data = [grid_str]
 
     grids = list(map(_parse, grid_data))
     if single:
@@ -4,16 +4,22 @@
 # (C) 2016 VRT Systems
 #
 # vim: set ts=4 sts=4 et tw=78 sw=4 si:
+import copy
 import datetime
 import logging
 import re
 import sys
+try:
+    from functools import lru_cache
+except ImportError:  # pragma: no cover
+    from backports.functools_lru_cache import lru_cache
 
 import iso8601
 import pyparsing as pp
 import six
 
 # Bring in special Project Haystack types and time zones
+from . import datatypes
 from .datatypes import Quantity, Coordinate, Uri, Bin, MARKER, NA, REMOVE, Ref, XStr
 from .grid import Grid
 # Bring in our sortable dict class to preserve order
@@ -32,6 +38,38 @@ NEWLINE_RE = re.compile(r'\r?\n')
 # Character number regex; for exceptions
 CHAR_NUM_RE = re.compile(r' *\(at char \d+\),')
 
+# Number of distinct ISO8601 date/time strings to remember.  Grids often
+# repeat the same timestamp down a column, so this saves re-parsing them.
+ISODATETIME_CACHE_LRU_SIZE = 4096
+
+# Number of distinct simple scalar strings to remember.  Markers, booleans,
+# numbers with units, references and timestamps repeat heavily in most grids.
+SCALAR_CACHE_LRU_SIZE = 65536
+
+# A "simple" scalar is one that can be parsed in isolation from the text that
+# surrounds it: strings, URIs, lists, dicts, nested grids and anything with
+# parentheses (coordinates, Bins, XStrs) are excluded, and it must be followed
+# by a separator (or nothing at all).  A space only continues a scalar when a
+# time zone name follows; otherwise it separates tags in dicts and metadata,
+# which are not cached.  Longer values are unlikely to repeat, so are skipped.
+SIMPLE_SCALAR_RE = re.compile(
+    r'[^ ,\n"`\[\]{}<>()]*(?: [A-Z][^ ,\n"`\[\]{}<>()]*)?')
+SIMPLE_SCALAR_ENDS = frozenset(['', ',', '\n', ']', '}'])
+SIMPLE_SCALAR_MAX_LEN = 64
+
+# Scalar types that can be handed out straight from the cache.  Anything else
+# (e.g. Ref and Quantity) is copied so each cell gets its own instance.
+IMMUTABLE_SCALARS = six.string_types + (float, bool, type(None),
+                                        datetime.date, datetime.time,
+                                        datatypes.Singleton)
+
+# Number of distinct column header lines to remember.  Grids from the same
+# source tend to repeat the same columns and column metadata.
+COLUMNS_CACHE_LRU_SIZE = 1024
+
+# A column header line can be parsed in isolation unless it embeds a grid.
+COLUMNS_LINE_RE = re.compile(r'[^\n<]*\n')
+
 
 def reformat_exception(ex_msg, line_num=None):
     print(ex_msg)
@@ -92,7 +130,7 @@ class ZincParseException(ValueError):
                     '< ' if (line == num) else ' |'
                 )
                 for (num, line_str)
-                in enumerate(grid_str.split('\n'), 1)
+                in enumerate(grid_str_lines, 1)
             ]
             formatted_lines.insert(line,
                                    (u'    | ' + linefmt + u' |') \
@@ -154,45 +192,203 @@ class GenerateMatch(object):
             return g
 
 
-def _unescape(s, uri=False):
+def _parse_isolated(expr, text, pint_mode):
+    """
+    Parse some text using the given grammar, returning the number of
+    characters consumed and the resulting tokens.  pint_mode is part of the
+    cache key as it changes what type of Quantity is produced.
+    """
+    (end, toks) = expr._parse(text, 0, True)
+    return (end, tuple(toks))
+
+
+_parse_simple_scalar = lru_cache(maxsize=SCALAR_CACHE_LRU_SIZE)(
+    _parse_isolated)
+_parse_columns = lru_cache(maxsize=COLUMNS_CACHE_LRU_SIZE)(_parse_isolated)
+
+
+def _fresh_value(value):
+    """
+    Return a value from the cache, re-building those types that can be
+    modified in place so no two cells or grids share the same instance.
+    """
+    if isinstance(value, IMMUTABLE_SCALARS):
+        return value
+    elif isinstance(value, (dict, SortableDict)):
+        return type(value)([(key, _fresh_value(val))
+                            for (key, val) in value.items()])
+    elif isinstance(value, (list, tuple)):
+        return type(value)([_fresh_value(val) for val in value])
+    elif isinstance(value, Ref):
+        return Ref(value.name, value.value, value.has_value)
+    elif isinstance(value, Quantity):
+        # Works for both BasicQuantity and PintQuantity.
+        return type(value)(value.value, value.unit)
+    elif isinstance(value, Coordinate):
+        return Coordinate(value.latitude, value.longitude)
+    elif isinstance(value, XStr):
+        return XStr(value.encoding, value.data_to_string())
+    else:
+        # Not a type we know how to re-build; play it safe.
+        return copy.deepcopy(value)
+
+
+def _isolate_scalar(instring, loc):
+    """
+    Return the simple scalar at loc along with the character that
+    terminates it, or None if there isn't one.
+    """
+    end = SIMPLE_SCALAR_RE.match(instring, loc).end()
+    if (loc < end <= loc + SIMPLE_SCALAR_MAX_LEN) \
+            and (instring[end:end + 1] in SIMPLE_SCALAR_ENDS):
+        return instring[loc:end + 1]
+
+
+def _isolate_columns(instring, loc):
+    """
+    Return the column header line at loc, or None if it embeds a grid.
+    """
+    match = COLUMNS_LINE_RE.match(instring, loc)
+    if match is not None:
+        return match.group(0)
+
+
+class CachedMatch(pp.ParseElementEnhance):
+    """
+    This class memoises the parsing of text that can be parsed in isolation
+    from whatever surrounds it.  isolate_fn says how much text that is (or
+    returns None if it can't be isolated), and parse_cached is the cache to
+    parse it with.  Anything else is handed to the wrapped grammar as-is.
+
+    Values taken from the cache are re-built so callers are free to modify
+    them.
+    """
+
+    def __init__(self, expr, isolate_fn, parse_cached):
+        super(CachedMatch, self).__init__(expr)
+        self._isolate = isolate_fn
+        self._parse_cached = parse_cached
+
+    def parseImpl(self, instring, loc, doActions=True):
+        text = self._isolate(instring, loc)
+        if text is not None:
+            try:
+                (length, toks) = self._parse_cached(
+                    self.expr, text, datatypes.MODE_PINT)
+                return (loc + length, [_fresh_value(tok) for tok in toks])
+            except pp.ParseBaseException:
+                # Let the grammar report the error in context.
+                pass
+        return self.expr._parse(instring, loc, doActions)
+
+
+class FirstCharMatch(pp.ParseElementEnhance):
     """
-    Iterative parser for string escapes.
+    This class matches the longest of the given alternatives like Or, but
+    only tries those alternatives that can start with the character found
+    at the current location.  Alternatives are given as (first_chars, expr)
+    pairs; characters not listed are handed to all alternatives.
     """
-    out = ''
-    while len(s) > 0:
-        c = s[0]
-        if c == '\\':
-            # Backslash escape
-            esc_c = s[1]
-
-            if esc_c in ('u', 'U'):
-                # Unicode escape
-                out += six.unichr(int(s[2:6], base=16))
-                s = s[6:]
-                continue
+
+    def __init__(self, alternatives):
+        super(FirstCharMatch, self).__init__(
+            Or([expr for (_, expr) in alternatives]))
+
+        by_char = {}
+        for (first_chars, expr) in alternatives:
+            for c in first_chars:
+                by_char.setdefault(c, []).append(expr)
+
+        # Characters with several alternatives get an Or of their own.  We
+        # keep track of these, as they are ours to name; the alternatives
+        # themselves may be shared with other parts of the grammar.
+        self._by_char = {}
+        self._own_exprs = [self.expr]
+        for (c, exprs) in by_char.items():
+            if len(exprs) == 1:
+                self._by_char[c] = exprs[0]
             else:
-                if esc_c == 'b':
-                    out += '\b'
-                elif esc_c == 'f':
-                    out += '\f'
-                elif esc_c == 'n':
-                    out += '\n'
-                elif esc_c == 'r':
-                    out += '\r'
-                elif esc_c == 't':
-                    out += '\t'
-                else:
-                    if uri and (esc_c == '#'):
-                        # \# is passed through with backslash.
-                        out += '\\'
-                    # Pass through
-                    out += esc_c
-                s = s[2:]
-                continue
-        else:
-            out += c
-            s = s[1:]
-    return out
+                self._by_char[c] = Or(exprs)
+                self._own_exprs.append(self._by_char[c])
+
+    def setName(self, name):
+        for expr in self._own_exprs:
+            expr.setName(name)
+        return super(FirstCharMatch, self).setName(name)
+
+    def streamline(self):
+        super(FirstCharMatch, self).streamline()
+        for expr in self._by_char.values():
+            expr.streamline()
+        return self
+
+    def parseImpl(self, instring, loc, doActions=True):
+        expr = self._by_char.get(instring[loc:loc + 1], self.expr)
+        return expr._parse(instring, loc, doActions)
+
+
+# Single-character string escapes
+UNESCAPE_CHARS = {
+    'b': '\b',
+    'f': '\f',
+    'n': '\n',
+    'r': '\r',
+    't': '\t',
+}
+ESCAPE_RE = re.compile(r'\\(.)', flags=re.DOTALL)
+
+
+def _unescape_str_char(match):
+    esc_c = match.group(1)
+    return UNESCAPE_CHARS.get(esc_c, esc_c)
+
+
+def _unescape_uri_char(match):
+    esc_c = match.group(1)
+    if esc_c == '#':
+        # \# is passed through with backslash.
+        return '\\#'
+    return UNESCAPE_CHARS.get(esc_c, esc_c)
+
+
+def _unescape(s, uri=False):
+    """
+    Iterative parser for string escapes.  Text between escapes is copied in
+    whole slices, so the cost is linear in the length of the string.
+    """
+    if '\\' not in s:
+        # Nothing to do
+        return s
+    elif ('\\u' not in s) and ('\\U' not in s):
+        # Only single-character escapes, let the regex engine do it.
+        return ESCAPE_RE.sub(
+            _unescape_uri_char if uri else _unescape_str_char, s)
+
+    out = []
+    pos = 0
+    while True:
+        esc = s.find('\\', pos)
+        if esc < 0:
+            out.append(s[pos:])
+            return ''.join(out)
+
+        out.append(s[pos:esc])
+        esc_c = s[esc + 1]
+        if esc_c in ('u', 'U'):
+            # Unicode escape
+            out.append(six.unichr(int(s[esc + 2:esc + 6], base=16)))
+            pos = esc + 6
+            continue
+
+        try:
+            out.append(UNESCAPE_CHARS[esc_c])
+        except KeyError:
+            if uri and (esc_c == '#'):
+                # \# is passed through with backslash.
+                out.append('\\')
+            # Pass through
+            out.append(esc_c)
+        pos = esc + 2
 
 
 # Grammar according to
@@ -202,11 +398,8 @@ def _unescape(s, uri=False):
 
 # Rudimentary elements
 hs_digit = Regex(r'\d')
-hs_digits = Regex(r'[0-9_]+').setParseAction(
-    lambda toks: [''.join([t.replace('_', '') for t in toks[0]])])
 hs_alphaLo = Regex(r'[a-z]')
 hs_alphaHi = Regex(r'[A-Z]')
-hs_alpha = Regex(r'[a-zA-Z]')
 hs_valueSep = Regex(r' *, *').setName('valueSep')
 hs_rowSep = Regex(r' *\n *').setName('rowSep')
 hs_plusMinus = Or([Literal('+'), Literal('-')])
@@ -215,8 +408,10 @@ hs_plusMinus = Or([Literal('+'), Literal('-')])
 hs_scalar_2_0 = Forward()
 hs_scalar_3_0 = Forward()
 hs_scalar = NearestMatch({
-    VER_2_0: hs_scalar_2_0,
-    VER_3_0: hs_scalar_3_0
+    VER_2_0: CachedMatch(hs_scalar_2_0, _isolate_scalar,
+                         _parse_simple_scalar),
+    VER_3_0: CachedMatch(hs_scalar_3_0, _isolate_scalar,
+                         _parse_simple_scalar)
 })
 
 hs_grid_2_0 = Forward()
@@ -227,11 +422,8 @@ hs_grid = NearestMatch({
 })
 
 # Co-ordinates
-hs_coordDeg = Combine(And([
-    Optional(Literal('-')),
-    Optional(hs_digits),
-    Optional(And([Literal('.'), hs_digits]))
-])).setParseAction(lambda toks: [float(toks[0] or '0')])
+hs_coordDeg = Regex(r'-?[0-9_]*(\.[0-9_]+)?').setParseAction(
+    lambda toks: [float(toks[0].replace('_', '') or '0')])
 hs_coord = And([Suppress(Literal('C(')),
                 hs_coordDeg,
                 Suppress(hs_valueSep),
@@ -254,42 +446,50 @@ hs_tzUTCOffset = Combine(And([
            ))]))
 hs_timeZoneName = Or([hs_tzUTCOffset, hs_tzName])
 hs_dateSep = CaselessLiteral('T')
-hs_date_str = Combine(And([
-    hs_digit, hs_digit, hs_digit, hs_digit,
-    Literal('-'),
-    hs_digit, hs_digit,
-    Literal('-'),
-    hs_digit, hs_digit]))
-hs_date = hs_date_str.copy().setParseAction(
-    lambda toks: [datetime.datetime.strptime(toks[0], '%Y-%m-%d').date()])
-
-hs_time_str = Combine(And([
-    hs_digit, hs_digit,
-    Literal(':'),
-    hs_digit, hs_digit,
-    Literal(':'),
-    hs_digit, hs_digit,
-    Optional(And([
-        Literal('.'),
-        OneOrMore(hs_digit)]))
-]))
+hs_date_str = Regex(r'\d{4}-\d{2}-\d{2}')
+
+
+def _parse_date(toks):
+    date_str = toks[0]
+    return [datetime.date(int(date_str[0:4]), int(date_str[5:7]),
+                          int(date_str[8:10]))]
+
+
+hs_date = hs_date_str.copy().setParseAction(_parse_date)
+
+hs_time_str = Regex(r'\d{2}:\d{2}:\d{2}(\.\d+)?')
 
 
 def _parse_time(toks):
     time_str = toks[0]
-    time_fmt = '%H:%M:%S'
-    if '.' in time_str:
-        time_fmt += '.%f'
-    return [datetime.datetime.strptime(time_str, time_fmt).time()]
+    # Fractional seconds are truncated to microseconds.
+    usec = time_str[9:15]
+    return [datetime.time(int(time_str[0:2]), int(time_str[3:5]),
+                          int(time_str[6:8]),
+                          int(usec.ljust(6, '0')) if usec else 0)]
 
 
 hs_time = hs_time_str.copy().setParseAction(_parse_time)
+
+
+_iso8601_parse_date = iso8601.parse_date
+
+
+@lru_cache(maxsize=ISODATETIME_CACHE_LRU_SIZE)
+def _parse_isodatetime(dt_str):
+    # The date separator comes from a CaselessLiteral('T') and so is always
+    # upper case, but a 'z' offset is passed through as lower case.
+    if ('z' in dt_str) or ('t' in dt_str):
+        dt_str = dt_str.upper()
+    return _iso8601_parse_date(dt_str)
+
+
 hs_isoDateTime = Combine(And([
     hs_date_str,
     hs_dateSep,
     hs_time_str,
     Optional(hs_tzHHMMOffset)
-])).setParseAction(lambda toks: [iso8601.parse_date(toks[0].upper())])
+])).setParseAction(lambda toks: [_parse_isodatetime(toks[0])])
 
 
 def _parse_datetime(toks):
@@ -325,63 +525,51 @@ hs_dateTime = And([
 ]).setParseAction(_parse_datetime)
 
 # Quantities and raw numeric values
-hs_unitChar = Or([
-    hs_alpha,
-    Word(u'%_/$' + u''.join([
-        six.unichr(c)
-        for c in range(0x0080, 0xffff)
-    ]), exact=1)
-])
-hs_unit = Combine(OneOrMore(hs_unitChar))
-hs_exp = Combine(And([
-    CaselessLiteral('e'),
-    Optional(hs_plusMinus),
-    hs_digits
-]))
-hs_decimal = Combine(And([
-    Optional(Literal('-')),
-    hs_digits,
-    Optional(And([
-        Literal('.'),
-        hs_digits
-    ])),
-    Optional(hs_exp)
-])).setParseAction(lambda toks: [float(toks[0])])
-
-hs_quantity = And([hs_decimal, hs_unit]).setParseAction(
-    lambda toks: [Quantity(toks[0], unit=toks[1])])
-hs_number = Or([
-    hs_quantity,
+# Units are matched whole rather than one character at a time.
+hs_unit = Regex(u'[a-zA-Z%_/$\u0080-\ufffe]+')
+# Numbers are matched by a single regex, then optionally followed by a unit.
+hs_decimal = Regex(r'-?[0-9_]+(\.[0-9_]+)?([eE][+\-]?[0-9_]+)?').setParseAction(
+    lambda toks: [float(toks[0].replace('_', ''))])
+
+
+def _parse_number(toks):
+    if len(toks) > 1:
+        return [Quantity(toks[0], unit=toks[1])]
+    else:
+        return [toks[0]]
+
+
+hs_number = And([
     hs_decimal,
-    Or([
-        Literal('INF'),
-        Literal('-INF'),
-        Literal('NaN')
-    ]).setParseAction(lambda toks: [float(toks[0])])
-])
+    Optional(hs_unit)
+]).setParseAction(_parse_number)
 
 # URIs
-hs_uriChar = Regex(r"([^\x00-\x1f\\`]|\\[bfnrt\\:/?" \
-                   + r"#\[\]@&=;`]|\\[uU][0-9a-fA-F]{4})")
-hs_uri = Combine(And([
+# The bodies of URIs and strings are each matched by a single regex rather
+# than character-by-character; the patterns are written as an "unrolled loop"
+# so that an unterminated value fails without excessive backtracking.  The
+# delimiters are kept separate so errors point at where the body ends.
+hs_uri = And([
     Suppress(Literal('`')),
-    ZeroOrMore(hs_uriChar),
+    Regex(r"[^\x00-\x1f\\`]*" \
+          + r"(?:\\(?:[bfnrt\\:/?#\[\]@&=;`]|[uU][0-9a-fA-F]{4})" \
+          + r"[^\x00-\x1f\\`]*)*"),
     Suppress(Literal('`'))
-])).setParseAction(lambda toks: [Uri(_unescape(toks[0], uri=True))])
+]).setParseAction(lambda toks: [Uri(_unescape(toks[0], uri=True))])
 
 # Strings
-hs_strChar = Regex(r"([^\x00-\x1f\\\"]|\\[bfnrt\\\"$]|\\[uU][0-9a-fA-F]{4})")
-hs_str = Combine(And([
+hs_str = And([
     Suppress(Literal('"')),
-    ZeroOrMore(hs_strChar),
+    Regex(r'[^\x00-\x1f\\"]*' \
+          + r'(?:\\(?:[bfnrt\\"$]|[uU][0-9a-fA-F]{4})' \
+          + r'[^\x00-\x1f\\"]*)*'),
     Suppress(Literal('"'))
-])).setParseAction(lambda toks: [_unescape(toks[0], uri=False)])
+]).setParseAction(lambda toks: [_unescape(toks[0], uri=False)])
 
 # References
-hs_refChar = Or([hs_alpha, hs_digit, Word('_:-.~', exact=1)])
 hs_ref = And([
     Suppress(Literal('@')),
-    Combine(ZeroOrMore(hs_refChar)),
+    Regex(r'[a-zA-Z\d_:\-.~]*'),
     Optional(And([
         Suppress(Literal(' ')),
         hs_str
@@ -391,12 +579,11 @@ hs_ref = And([
     ])
 
 # Bins
-hs_binChar = Regex(r"[\x20-\x27\x2a-\x7f]")
-hs_bin = Combine(And([
+hs_bin = And([
     Suppress(Literal('Bin(')),
-    Combine(ZeroOrMore(hs_binChar)),
+    Regex(r'[\x20-\x27\x2a-\x7f]*'),
     Suppress(Literal(')'))
-])).setParseAction(lambda toks: [Bin(toks[0])])
+]).setParseAction(lambda toks: [Bin(toks[0])])
 
 # Haystack 3.0 XStr(...)
 hs_xstr = And([
@@ -406,19 +593,24 @@ hs_xstr = And([
     Suppress(Literal(')'))
 ]).setParseAction(lambda toks: [XStr(toks[0], toks[1])])
 
-# Booleans
-hs_bool = Word('TF', min=1, max=1, exact=1).setParseAction( \
-    lambda toks: [toks[0] == 'T'])
-
-# Singleton values
-hs_remove = Literal('R').setParseAction( \
-    lambda toks: [REMOVE]).setName('remove')
-hs_marker = Literal('M').setParseAction( \
-    lambda toks: [MARKER]).setName('marker')
-hs_null = Literal('N').setParseAction( \
-    lambda toks: [None]).setName('null')
-hs_na = Literal('NA').setParseAction( \
-    lambda toks: [NA]).setName('na')
+# Singleton values: booleans, null, marker, remove, NA and the special
+# numeric values.  These are matched by one regex and looked up in a dict
+# rather than trying a separate grammar element for each.
+SINGLETONS = {
+    'M': MARKER,
+    'N': None,
+    'NA': NA,
+    'R': REMOVE,
+    'T': True,
+    'F': False,
+    'INF': float('INF'),
+    '-INF': -float('INF'),
+    'NaN': float('nan'),
+}
+hs_singleton_2_0 = Regex(r'-INF|INF|NaN|[MNRTF]').setParseAction( \
+    lambda toks: [SINGLETONS[toks[0]]]).setName('singleton')
+hs_singleton_3_0 = Regex(r'-INF|INF|NaN|NA|[MNRTF]').setParseAction( \
+    lambda toks: [SINGLETONS[toks[0]]]).setName('singleton')
 # Lists, these will probably be in Haystack 4.0, so let's not
 # assume a version.  There are three cases:
 # - Empty list: [ {optional whitespace} ]
@@ -444,9 +636,10 @@ hs_list = GenerateMatch( \
 hs_id = Regex(r'[a-z][a-zA-Z0-9_]*').setName('id')
 
 # Grid building blocks
+# An empty cell is null.  This is a single attempt at parsing a scalar,
+# rather than an Or that would try both and then parse the winner again.
 hs_cell = GenerateMatch( \
-    lambda ver: Or([Empty().copy().setParseAction(lambda toks: [None]), \
-                    hs_scalar[ver]]).setName('cell'))
+    lambda ver: Optional(hs_scalar[ver], default=None).setName('cell'))
 
 # Dict
 # There are three cases:
@@ -454,18 +647,17 @@ hs_cell = GenerateMatch( \
 # - map with marker: { m }
 # - dics: { k:1  ]
 #
-hs_tagmarker = hs_id
-
-hs_tagpair = GenerateMatch(
+# The tag name is lexed once by hs_id; an optional ':' and value then
+# decide whether it is a name/value pair or a marker.
+hs_tag = GenerateMatch(
     lambda ver: And([hs_id,
-                     Suppress(Regex(r': *')),
-                     hs_scalar[ver]
+                     Optional(And([
+                         Suppress(Regex(r': *')),
+                         hs_scalar[ver]
+                     ]))
                      ])
-        .setParseAction(lambda toks: tuple(toks[:2]))
-        .setName('tagPair'))
-
-hs_tag = GenerateMatch(
-    lambda ver: Or([hs_tagmarker, hs_tagpair[ver]])
+        .setParseAction(lambda toks: tuple(toks[:2]) \
+                        if len(toks) > 1 else toks[0])
         .setName('tag'))
 
 hs_tags = GenerateMatch(
@@ -523,13 +715,38 @@ hs_inner_grid = GenerateMatch( \
         Suppress(Regex(r' *>>')),
     ]))
 
+# First characters of each scalar type
+DIGITS = '0123456789'
+ALPHA = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
 # All possible scalar values, by Haystack version
-hs_scalar_2_0 <<= Or([hs_ref, hs_bin, hs_str, hs_uri, hs_dateTime,
-                      hs_date, hs_time, hs_coord, hs_number, hs_null, hs_marker,
-                      hs_remove, hs_bool]).setName('scalar')
-hs_scalar_3_0 <<= Or([hs_ref, hs_xstr, hs_str, hs_uri, hs_dateTime,
-                      hs_date, hs_time, hs_coord, hs_number, hs_na, hs_null, hs_marker,
-                      hs_remove, hs_bool, hs_list[VER_3_0], hs_dict[VER_3_0], hs_inner_grid[VER_3_0]]).setName('scalar')
+hs_scalar_2_0 <<= FirstCharMatch([
+    ('@', hs_ref),
+    ('B', hs_bin),
+    ('"', hs_str),
+    ('`', hs_uri),
+    (DIGITS, hs_dateTime),
+    (DIGITS, hs_date),
+    (DIGITS, hs_time),
+    ('C', hs_coord),
+    (DIGITS + '-_', hs_number),
+    ('MNRTFI-', hs_singleton_2_0),
+]).setName('scalar')
+hs_scalar_3_0 <<= FirstCharMatch([
+    ('@', hs_ref),
+    (ALPHA + DIGITS + '_', hs_xstr),
+    ('"', hs_str),
+    ('`', hs_uri),
+    (DIGITS, hs_dateTime),
+    (DIGITS, hs_date),
+    (DIGITS, hs_time),
+    ('C', hs_coord),
+    (DIGITS + '-_', hs_number),
+    ('MNRTFI-', hs_singleton_3_0),
+    ('[ *', hs_list[VER_3_0]),
+    ('{ *', hs_dict[VER_3_0]),
+    ('<', hs_inner_grid[VER_3_0]),
+]).setName('scalar')
 
 hs_nl = Combine(And([Optional(Literal('\r')), Literal('\n')]))
 
@@ -542,29 +759,26 @@ hs_row = GenerateMatch( \
 hs_rows = GenerateMatch( \
     lambda ver: Group(ZeroOrMore(hs_row[ver])).setName("rows"))
 
-hs_metaPair = GenerateMatch( \
+# A meta item is either a marker (just the tag name) or a tag name followed
+# by a value.  The tag name is matched once, then the value is optional.
+hs_metaItem = GenerateMatch( \
     lambda ver: And([ \
         hs_id, \
-        Suppress(And([ \
-            ZeroOrMore(Literal(' ')), \
-            Literal(':'), \
-            ZeroOrMore(Literal(' ')) \
-            ])), \
-        hs_scalar[ver] \
-        ]).setParseAction(lambda toks: [tuple(toks[:2])]).setName('metaPair'))
-hs_metaMarker = hs_id.copy().setParseAction( \
-    lambda toks: [(toks[0], MARKER)]).setName('metaMarker')
-hs_metaItem = GenerateMatch( \
-    lambda ver: Or([ \
-        hs_metaMarker, \
-        hs_metaPair[ver] \
-        ]).setName('metaItem'))
+        Optional(And([ \
+            Suppress(Regex(r' *: *')), \
+            hs_scalar[ver] \
+            ])) \
+        ]).setParseAction(lambda toks: [ \
+        (toks[0], toks[1] if len(toks) > 1 else MARKER)]).setName('metaItem'))
 hs_meta = GenerateMatch( \
     lambda ver: DelimitedList(hs_metaItem[ver], \
                               delim=' ').setParseAction( \
         lambda toks: [SortableDict(toks.asList())] \
         ).setName('meta'))
 
+# Columns without metadata all share the same (immutable) empty metadata.
+NO_COLUMN_META = ()
+
 hs_col = GenerateMatch( \
     lambda ver: And([ \
         hs_id, \
@@ -573,16 +787,16 @@ hs_col = GenerateMatch( \
             hs_meta[ver]
         ])).setName('colMeta') \
         ]).setParseAction(lambda toks: [ \
-        (toks[0], toks[1] if len(toks) > 1 else {})]))
+        (toks[0], toks[1] if len(toks) > 1 else NO_COLUMN_META)]))
 
 hs_cols = GenerateMatch( \
-    lambda ver: And([
+    lambda ver: CachedMatch(And([
         DelimitedList(
             hs_col[ver], delim=hs_valueSep).setParseAction(  # + hs_nl
             lambda toks: [SortableDict(toks.asList())]),
         Suppress(Regex(r' *')),
         Suppress(hs_nl)
-    ])
+    ]), _isolate_columns, _parse_columns)
 )
 
 hs_gridVer = Combine(And([Suppress(Literal('ver:')) + hs_str]))
@@ -618,8 +832,9 @@ def _gen_grid(toks):
         rows = []
     g = Grid(version=grid_meta.pop('ver'),
              metadata=grid_meta,
-             columns=list(col_meta.items()))
-    g.extend(map(lambda row: dict(zip(col_meta.keys(), row)), rows))
+             columns=col_meta)
+    col_names = tuple(col_meta.keys())
+    g.extend([dict(zip(col_names, row)) for row in rows])
     return g
 
 
@@ -645,7 +860,7 @@ def parse_grid(grid_data, parseAll=True):
         ver_match = VERSION_RE.match(grid_data)
         if ver_match is None:
             raise ZincParseException(
-                'Could not determine version from %r' % NEWLINE_RE.split(grid_data)[0],
+                'Could not determine version from %r' % NEWLINE_RE.split(grid_data, 1)[0],
                 grid_data, 1, 1)
         version = Version(ver_match.group(1))
 
@@ -7,6 +7,10 @@
 
 import pytz
 import datetime
+try:
+    from functools import lru_cache
+except ImportError:  # pragma: no cover
+    from backports.functools_lru_cache import lru_cache
 
 from .version import LATEST_VER
 
@@ -458,9 +462,11 @@ def get_tz_rmap(version=LATEST_VER):
     _gen_map()
     return _TZ_RMAP
 
+@lru_cache(maxsize=None)
 def timezone(haystack_tz, version=LATEST_VER):
     """
-    Retrieve the Haystack timezone
+    Retrieve the Haystack timezone.  Results are cached as there are only a
+    few hundred Haystack timezones and parsers look them up once per value.
     """
     tz_map = get_tz_map(version=version)
     try:
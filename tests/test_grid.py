@@ -360,6 +360,28 @@ def test_grid_index():
     assert grid.get('idx4')
 
 
+def test_grid_extend_index():
+    grid = Grid(columns={'id': {}, 'val': {}})
+    grid.extend(map(lambda n: {'val': n}, range(3)))
+    assert len(grid) == 3
+    grid.extend([{'id': 'id1'}, {'id': 'id2', 'val': 3}])
+    assert len(grid) == 5
+    assert grid['id1'] is grid[3]
+    assert grid['id2'] is grid[4]
+    del grid[3]
+    assert grid.get('id1') is None
+
+
+def test_grid_extend_notdict():
+    grid = Grid(columns={'val': {}})
+    try:
+        grid.extend([{'val': 1}, 'This is not a dict'])
+        assert False, 'Accepted a string'
+    except TypeError:
+        pass
+    assert len(grid) == 0
+
+
 def test_slice():
     grid = Grid(columns={'id': {}, 'site': {}})
     grid.append({'id': 'id1', })
@@ -18,7 +18,8 @@ import pytest
 
 import hszinc
 from hszinc import MARKER, Grid, MODE_JSON, XStr, dump_scalar, MODE_ZINC
-from hszinc.zincparser import hs_row, _unescape, ZincParseException
+from hszinc.zincparser import hs_row, _unescape, _parse_simple_scalar, \
+    ZincParseException
 from .pint_enable import _enable_pint
 
 # These are examples taken from http://project-haystack.org/doc/Zinc
@@ -838,13 +839,20 @@ def _check_time(pint_en):
 time
 08:12:05
 08:12:05.5
+12:34:56.1
+12:34:56.12345
+12:34:56.1234567
 ''', single=True)
 
-    assert len(grid) == 2
+    assert len(grid) == 5
     assert isinstance(grid[0]['time'], datetime.time)
     assert grid[0]['time'] == datetime.time(8, 12, 5)
     assert isinstance(grid[1]['time'], datetime.time)
     assert grid[1]['time'] == datetime.time(8, 12, 5, 500000)
+    assert grid[2]['time'] == datetime.time(12, 34, 56, 100000)
+    assert grid[3]['time'] == datetime.time(12, 34, 56, 123450)
+    # Anything finer than a microsecond is truncated.
+    assert grid[4]['time'] == datetime.time(12, 34, 56, 123456)
 
 
 @pytest.mark.parametrize("with_pint", [(False,), (True,)])
@@ -2202,8 +2210,109 @@ def _check_grid_in_grid_in_grid_json(pint_en=True):
 
 def test_unescape():
     assert _unescape("a\\nb") == "a\nb"
+    assert _unescape("") == ""
+    assert _unescape('\\t\\u00e9\\\\\\"x') == '\t\u00e9\\"x'
+    assert _unescape("a\\#b\\:c", uri=True) == "a\\#b:c"
 
 def test_bidon():
     hszinc.parse('''ver:"3.0"
 filter
 "a"\n''',mode=MODE_ZINC, single=True)
+
+def test_repeated_scalars():
+    # Repeated values may come from a cache, but must still honour the
+    # current Quantity mode.
+    grid_str = '''ver:"3.0"
+val,m
+12.5kW,M
+12.5kW,M
+'''
+    for pint_en, cls in ((False, hszinc.datatypes.BasicQuantity),
+                         (True, hszinc.datatypes.PintQuantity)):
+        _enable_pint(pint_en)
+        grid = hszinc.parse(grid_str, mode=MODE_ZINC, single=True)
+        assert len(grid) == 2
+        for row in grid:
+            assert isinstance(row['val'], cls)
+            assert row['val'] == hszinc.Quantity(12.5, 'kW')
+            assert row['m'] is MARKER
+    _enable_pint(False)
+
+def test_repeated_scalars_not_shared():
+    # Cached values must not leak changes between cells or parses.
+    grid_str = '''ver:"3.0"
+id,val
+@a,12kW
+@a,12kW
+'''
+    first = hszinc.parse(grid_str, mode=MODE_ZINC, single=True)
+    assert first[0]['id'] is not first[1]['id']
+    assert first[0]['val'] is not first[1]['val']
+    first[0]['id'].name = 'other'
+    first[0]['val'].unit = 'W'
+    assert first[1]['id'].name == 'a'
+    assert first[1]['val'].unit == 'kW'
+    second = hszinc.parse(grid_str, mode=MODE_ZINC, single=True)
+    assert second[0]['id'].name == 'a'
+    assert second[0]['val'] == hszinc.Quantity(12, 'kW')
+
+def test_long_dict_not_cached():
+    # Space-separated tags in dicts and metadata must not be cached as
+    # one long scalar each.
+    tags = ' '.join(['t%d:%d' % (n, n) for n in range(1000)])
+    grid_str = 'ver:"3.0" %s\nv %s\n{%s}\n' % (tags, tags, tags)
+    _parse_simple_scalar.cache_clear()
+    grid = hszinc.parse(grid_str, mode=MODE_ZINC, single=True)
+    assert grid.metadata['t999'] == 999
+    assert grid.column['v']['t999'] == 999
+    assert grid[0]['v']['t999'] == 999
+    assert _parse_simple_scalar.cache_info().currsize < 5
+
+def test_unterminated_str():
+    # This should fail promptly, not backtrack through the whole string.
+    with pytest.raises(ZincParseException):
+        hszinc.parse_scalar('"' + ('\\n' * 5000), mode=MODE_ZINC)
+    with pytest.raises(ZincParseException):
+        hszinc.parse_scalar('`' + ('a/' * 5000), mode=MODE_ZINC)
+    # The error points at where the string should have ended.
+    with pytest.raises(ZincParseException) as exc_info:
+        hszinc.parse_scalar('"a', mode=MODE_ZINC)
+    assert exc_info.value.col == 3
+
+def test_bad_scalar_message():
+    # Unrecognised input should be reported as such, not as the grammar.
+    for version in ('2.0', '3.0'):
+        with pytest.raises(ZincParseException) as exc_info:
+            hszinc.parse_scalar('+1', mode=MODE_ZINC, version=version)
+        assert str(exc_info.value).startswith(
+            "Failed to parse scalar: Expected scalar, found '+' "
+            "(line:1, col:1)\n")
+    # Naming the scalar grammar must not rename the elements it is built from.
+    assert hszinc.zincparser.hs_singleton_2_0.name == 'singleton'
+    assert hszinc.zincparser.hs_str.name != 'scalar'
+
+def test_repeated_columns():
+    # Column headers may come from a cache, but each grid must still get
+    # its own column metadata.
+    grid_str = '''ver:"3.0"
+id,power unit:"kW" his tags:[1,2] x:{a:1} r:@foo max:5kW c:C(1,2) s:Foo("y")
+@a,1kW
+'''
+    first = hszinc.parse(grid_str, mode=MODE_ZINC, single=True)
+    first.column['power']['unit'] = 'W'
+    first.column['power']['tags'].append(99)
+    first.column['power']['x']['a'] = 2
+    first.column['power']['r'].name = 'bar'
+    first.column['power']['max'].unit = 'W'
+    first.column['power']['c'].latitude = 3
+    first.column['power']['s'].data = 'z'
+    second = hszinc.parse(grid_str, mode=MODE_ZINC, single=True)
+    assert list(second.column.keys()) == ['id', 'power']
+    assert second.column['power']['unit'] == 'kW'
+    assert second.column['power']['his'] is MARKER
+    assert second.column['power']['tags'] == [1.0, 2.0]
+    assert second.column['power']['x'] == {'a': 1.0}
+    assert second.column['power']['r'].name == 'foo'
+    assert second.column['power']['max'] == hszinc.Quantity(5, 'kW')
+    assert second.column['power']['c'] == hszinc.Coordinate(1, 2)
+    assert second.column['power']['s'] == XStr('Foo', 'y')